@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import numpy as np
+
+class ResultCache:
+    def __init__(self, root="cache", max_bytes=256 * 1024 * 1024):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.results_dir = os.path.join(root, "results")
+        self.arrays_dir = os.path.join(root, "indicators")
+
+    # ==========================
+    # KEYS
+    # ==========================
+    @staticmethod
+    def make_key(*parts):
+        blob = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def fingerprint(data):
+        return hashlib.sha256(np.ascontiguousarray(data).tobytes()).hexdigest()
+
+    # ==========================
+    # RESULTS (summary + report)
+    # ==========================
+    def get_result(self, key):
+        path = os.path.join(self.results_dir, f"{key}.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f: entry = json.load(f)
+        except Exception: return None
+        # A hit is only useful if the report it points at is still on disk
+        if not os.path.exists(entry.get("report_path") or ""):
+            self._remove(path); return None
+        self._touch(path)
+        return entry["summary"], entry["report_path"]
+
+    def put_result(self, key, summary, report_path):
+        entry = {"summary": summary, "report_path": report_path}
+        self._write(os.path.join(self.results_dir, f"{key}.json"), lambda f: f.write(json.dumps(entry).encode("utf-8")))
+
+    # ==========================
+    # INDICATOR ARRAYS
+    # ==========================
+    def get_arrays(self, key):
+        path = os.path.join(self.arrays_dir, f"{key}.npz")
+        try:
+            with np.load(path) as data: arrays = {name: data[name] for name in data.files}
+        except Exception: return None
+        self._touch(path)
+        return arrays
+
+    def put_arrays(self, key, arrays):
+        self._write(os.path.join(self.arrays_dir, f"{key}.npz"), lambda f: np.savez(f, **arrays))
+
+    # ==========================
+    # STORAGE / LRU EVICTION
+    # ==========================
+    def _write(self, path, writer):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f: writer(f)
+            os.replace(tmp, path)
+        except Exception:
+            self._remove(tmp); return
+        self._evict()
+
+    def _touch(self, path):
+        try: os.utime(path, None)
+        except Exception: pass
+
+    def _remove(self, path):
+        try: os.remove(path)
+        except Exception: pass
+
+    def _report_of(self, path):
+        if not path.endswith(".json"): return None
+        try:
+            with open(path, "r", encoding="utf-8") as f: return json.load(f).get("report_path")
+        except Exception: return None
+
+    def _remove_entry(self, path):
+        # A result entry owns its HTML report, so the report goes with it
+        report_path = self._report_of(path)
+        if report_path: self._remove(report_path)
+        self._remove(path)
+
+    def _entries(self):
+        entries = []
+        for folder in (self.results_dir, self.arrays_dir):
+            if not os.path.isdir(folder): continue
+            for name in os.listdir(folder):
+                if name.endswith(".tmp"): continue
+                path = os.path.join(folder, name)
+                try: st = os.stat(path)
+                except Exception: continue
+                size = st.st_size
+                report_path = self._report_of(path)
+                if report_path and os.path.exists(report_path): size += os.path.getsize(report_path)
+                entries.append((st.st_mtime, size, path))
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        # Least recently used first (mtime is bumped on every hit)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes: break
+            self._remove_entry(path)
+            total -= size
+
+    def clear(self):
+        for _, _, path in self._entries(): self._remove_entry(path)
@@ -15,9 +15,14 @@ from email.message import EmailMessage
 from scipy.signal import argrelextrema
 from itertools import combinations
 from dotenv import load_dotenv
+from bot.cache import ResultCache
+from bot.indicators import batch_indicators
 
 load_dotenv()
 
+# Bump whenever strategy/backtest/report logic changes so stale cached results are ignored
+ENGINE_VERSION = "2.0.0"
+
 class TradingEngine:
     def __init__(self):
         self.is_running = False
@@ -56,6 +61,8 @@ class TradingEngine:
         }
         self.DEFAULT_PARAM = {'sl': 3.0, 'cooldown': 30, 'zone': 4.0, 'ema': 6.0, 'rsi': (35, 65), 'magic': 123456}
         self.cooldown_tracker = {}
+        self.structure_cache = {}
+        self.cache = ResultCache()
 
         self.load_settings()
         if not self.config["active_indices"]:
@@ -114,7 +121,14 @@ class TradingEngine:
                 max_touches = current_touches; best_line = (m, c)
         return best_line
 
-    def get_market_data(self, symbol, trend_mode):
+    def get_structure_levels(self, symbol, trend_mode):
+        # H1 swings and the trendline search only change when a new H1 bar opens
+        last_bar = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_H1, 0, 1)
+        if last_bar is None or len(last_bar) == 0: return None
+        bar_time = int(last_bar['time'][-1])
+        cached = self.structure_cache.get(symbol)
+        if cached and cached[0] == bar_time and cached[1] == trend_mode: return cached[2]
+
         rates_h1 = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_H1, 0, 1000)
         if rates_h1 is None: return None
         df_h1 = pd.DataFrame(rates_h1)
@@ -122,25 +136,27 @@ class TradingEngine:
         n = 5
         df_h1['Swing_High'] = df_h1.iloc[argrelextrema(df_h1['high'].values, np.greater_equal, order=n)[0]]['high']
         df_h1['Swing_Low'] = df_h1.iloc[argrelextrema(df_h1['low'].values, np.less_equal, order=n)[0]]['low']
-        trend_m, trend_c = self.calculate_dynamic_trendline(df_h1, mode=trend_mode)
+        trend_m, trend_c = self.calculate_dynamic_trendline(df_h1, mode=trend_mode) or (None, None)
         last_res = df_h1['Swing_High'].ffill().iloc[-1]
         last_sup = df_h1['Swing_Low'].ffill().iloc[-1]
-        
-        rates_m1 = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M1, 0, 200)
-        if rates_m1 is None: return None
-        df_m1 = pd.DataFrame(rates_m1)
-        df_m1['EMA20'] = ta.ema(df_m1['close'], length=20)
-        df_m1['EMA50'] = ta.ema(df_m1['close'], length=50)
-        df_m1['EMA200'] = ta.ema(df_m1['close'], length=200)
-        df_m1['RSI'] = ta.rsi(df_m1['close'], length=14)
-        df_m1['ATR'] = ta.atr(df_m1['high'], df_m1['low'], df_m1['close'], length=14)
-        
-        return {
-            'last_sup': last_sup, 'last_res': last_res, 'trend_m': trend_m, 'trend_c': trend_c,
-            'ema20': df_m1['EMA20'].iloc[-1], 'ema50': df_m1['EMA50'].iloc[-1], 'ema200': df_m1['EMA200'].iloc[-1],
-            'rsi': df_m1['RSI'].iloc[-1], 'atr': df_m1['ATR'].iloc[-1], 
-            'vol_ok': df_m1['ATR'].iloc[-1] > df_m1['ATR'].rolling(window=10).mean().iloc[-1]
-        }
+        levels = {'last_sup': last_sup, 'last_res': last_res, 'trend_m': trend_m, 'trend_c': trend_c}
+        self.structure_cache[symbol] = (bar_time, trend_mode, levels)
+        return levels
+
+    def get_market_data(self, symbol, trend_mode):
+        return self.get_market_data_batch({symbol: trend_mode}).get(symbol)
+
+    def get_market_data_batch(self, trend_modes):
+        # One stacked indicator pass over the M1 data of every symbol (see bot.indicators)
+        structure = {}; rates_m1 = {}
+        for symbol, trend_mode in trend_modes.items():
+            rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M1, 0, 200)
+            if rates is None: continue
+            levels = self.get_structure_levels(symbol, trend_mode)
+            if levels is None: continue
+            structure[symbol] = levels; rates_m1[symbol] = rates
+        indicators = batch_indicators(rates_m1)
+        return {symbol: {**structure[symbol], **indicators[symbol]} for symbol in indicators}
 
     def execute_trade(self, symbol, action, sl_pips, reason, magic_num):
         tick = mt5.symbol_info_tick(symbol)
@@ -259,15 +275,26 @@ class TradingEngine:
     # ==========================
     # ANALYTICS ENGINES
     # ==========================
-    def run_monte_carlo(self, symbol="Portfolio", start_balance=1000.0, win_rate=0.55, reward_ratio=2.0, risk=0.02):
+    def monte_carlo_key(self, symbol="Portfolio", start_balance=1000.0, win_rate=0.55, reward_ratio=2.0, risk=0.02, seed=1):
+        # Seeded and anchored to today's date so a cached run is exactly what these inputs produce
+        start_date = datetime.datetime.combine(datetime.date.today(), datetime.time())
+        return self.cache.make_key("monte_carlo", symbol, start_balance, win_rate, reward_ratio, risk, seed, start_date, ENGINE_VERSION)
+
+    def run_monte_carlo(self, symbol="Portfolio", start_balance=1000.0, win_rate=0.55, reward_ratio=2.0, risk=0.02, seed=1, progress=None, cancelled=None):
+        start_date = datetime.datetime.combine(datetime.date.today(), datetime.time())
+        cache_key = self.monte_carlo_key(symbol, start_balance, win_rate, reward_ratio, risk, seed)
+        cached = self.cache.get_result(cache_key)
+        if cached: return cached
+
+        rng = random.Random(seed)
         trades_list = []
         balance = start_balance; peak = start_balance; max_dd = 0.0
-        current_date = datetime.datetime.now()
+        current_date = start_date
         
         # 1. Simulate Median Path
         for i in range(300):
             current_date += datetime.timedelta(hours=4)
-            is_win = random.random() < win_rate
+            is_win = rng.random() < win_rate
             risk_amt = balance * risk
             pnl = (risk_amt * reward_ratio) if is_win else -risk_amt
             balance += pnl
@@ -276,7 +303,7 @@ class TradingEngine:
             if dd > max_dd: max_dd = dd
             
             entry_price = 1000.0 + (i * 2) 
-            trade_type = "BUY" if random.random() > 0.5 else "SELL"
+            trade_type = "BUY" if rng.random() > 0.5 else "SELL"
             move = (risk_amt / 10) if is_win else -(risk_amt / 10)
             exit_price = entry_price + move if trade_type == "BUY" else entry_price - move
 
@@ -285,48 +312,86 @@ class TradingEngine:
                 "Type": trade_type, "Entry": entry_price, "Exit": exit_price
             })
             if balance <= 0: break
+            if i % 50 == 0 and cancelled and cancelled(): return "Cancelled", None
             
         risk_stats = {}
-        for test_bal in [500, 1000, 2000, 5000]:
+        test_balances = [500, 1000, 2000, 5000]
+        total_paths = len(test_balances) * 1000; paths_done = 0
+        for test_bal in test_balances:
             ruined = 0
             for _ in range(1000):
+                if paths_done % 100 == 0:
+                    if cancelled and cancelled(): return "Cancelled", None
+                    if progress: progress(paths_done, total_paths)
+                paths_done += 1
                 sim_bal = test_bal
                 for _ in range(300):
-                    sim_bal += (sim_bal*risk*reward_ratio) if random.random() < win_rate else -(sim_bal*risk)
+                    sim_bal += (sim_bal*risk*reward_ratio) if rng.random() < win_rate else -(sim_bal*risk)
                     if sim_bal < (test_bal*0.4): ruined += 1; break
             risk_stats[test_bal] = (ruined/1000)*100
+        if cancelled and cancelled(): return "Cancelled", None
             
         df_trades = pd.DataFrame(trades_list)
         df_trades['Time'] = pd.to_datetime(df_trades['Time']) 
         df_trades['Month'] = df_trades['Time'].dt.strftime('%Y-%m')
         monthly_data = [{"Month": name, "Net_Profit": g['PnL'].sum(), "Trades": len(g)} for name, g in df_trades.groupby('Month')]
         stats = {'trades_df': df_trades, 'monthly_df': pd.DataFrame(monthly_data), 'max_dd_global': max_dd, 'risk_stats': risk_stats}
-        return self.generate_html_report("Risk Simulation", symbol, stats, balance, start_balance)
+        report_path = self.generate_html_report("Risk Simulation", symbol, stats, balance, start_balance)
 
-    def run_backtest(self, symbol, days=60): # <--- FIXED: Default 60 days
+        wins = len(df_trades[df_trades['PnL'] > 0])
+        summary = {
+            "net_profit": float(balance - start_balance),
+            "win_rate": float(wins / len(df_trades) * 100),
+            "final_balance": float(balance),
+            "total_trades": int(len(df_trades))
+        }
+        self.cache.put_result(cache_key, summary, report_path)
+        return summary, report_path
+
+    def run_backtest(self, symbol, days=60, end=None, progress=None, cancelled=None): # <--- FIXED: Default 60 days
         if not mt5.initialize(): return "MT5 Not Connected", None
-        utc_to = datetime.datetime.now(datetime.timezone.utc)
+        # Default to the last closed hour so re-runs within the hour resolve to the same M1 range
+        utc_to = end or datetime.datetime.now(datetime.timezone.utc).replace(minute=0, second=0, microsecond=0)
+        utc_from = utc_to - datetime.timedelta(days=days)
         
         # 1. Fetch Real Data (2 Months)
-        rates = mt5.copy_rates_range(symbol, mt5.TIMEFRAME_M1, utc_to - datetime.timedelta(days=days), utc_to)
+        rates = mt5.copy_rates_range(symbol, mt5.TIMEFRAME_M1, utc_from, utc_to)
         if rates is None or len(rates) == 0: return "No Data", None
+        if cancelled and cancelled(): return "Cancelled", None
+        
+        cfg = self.STRATEGY_PARAMS.get(symbol, self.DEFAULT_PARAM)
+        data_fp = self.cache.fingerprint(rates)
+        cache_key = self.cache.make_key("backtest", symbol, utc_from, utc_to, data_fp, cfg, self.config['lot_size'], ENGINE_VERSION)
+        cached = self.cache.get_result(cache_key)
+        if cached: return cached
         
         df = pd.DataFrame(rates)
         # 2. Fix Timestamps (Convert Unix to Datetime)
         df['time'] = pd.to_datetime(df['time'], unit='s') 
         
-        # 3. Calculate Indicators
-        df['EMA200'] = ta.ema(df['close'], length=200)
-        df['RSI'] = ta.rsi(df['close'], length=14)
-        df['ATR'] = ta.atr(df['high'], df['low'], df['close'], length=14)
+        # 3. Calculate Indicators (shared across backtests on the same symbol + range)
+        ind_key = self.cache.make_key("indicators", symbol, data_fp, ENGINE_VERSION)
+        indicators = self.cache.get_arrays(ind_key)
+        if indicators is None:
+            indicators = {
+                'EMA200': ta.ema(df['close'], length=200).to_numpy(dtype=float),
+                'RSI': ta.rsi(df['close'], length=14).to_numpy(dtype=float),
+                'ATR': ta.atr(df['high'], df['low'], df['close'], length=14).to_numpy(dtype=float)
+            }
+            self.cache.put_arrays(ind_key, indicators)
+        for name, values in indicators.items(): df[name] = values
+        if cancelled and cancelled(): return "Cancelled", None
         
         balance = 1000.0; peak_bal = 1000.0; max_dd = 0.0
         trades_list = []
-        cfg = self.STRATEGY_PARAMS.get(symbol, self.DEFAULT_PARAM)
         MODE = 'BUY' if 'Boom' in symbol else 'SELL'
         
         # 4. Run Strategy on Real Data
+        total_bars = len(df) - 200
         for i in range(200, len(df)):
+            if (i - 200) % 1000 == 0:
+                if cancelled and cancelled(): return "Cancelled", None
+                if progress: progress(i - 200, total_bars)
             row = df.iloc[i]
             # Simple Logic: EMA Trend + RSI Condition (Faster proxy for full engine)
             signal = False
@@ -366,6 +431,7 @@ class TradingEngine:
                     i += 15 # Skip ahead to avoid spam signals
 
         if not trades_list: return "No Trades Found", None
+        if cancelled and cancelled(): return "Cancelled", None
 
         # Compile Data
         df_trades = pd.DataFrame(trades_list)
@@ -379,11 +445,13 @@ class TradingEngine:
         
         wins = len(df_trades[df_trades['PnL'] > 0])
         summary = {
-            "net_profit": balance - 1000.0,
-            "win_rate": (wins / len(df_trades) * 100),
-            "final_balance": balance,
-            "total_trades": len(df_trades)
+            "net_profit": float(balance - 1000.0),
+            "win_rate": float(wins / len(df_trades) * 100),
+            "final_balance": float(balance),
+            "total_trades": int(len(df_trades)),
+            "range": f"{utc_from:%Y-%m-%d %H:%M} – {utc_to:%Y-%m-%d %H:%M} UTC"
         }
+        self.cache.put_result(cache_key, summary, report_path)
         return summary, report_path
 
     # ==========================
@@ -0,0 +1,71 @@
+import sys
+import numpy as np
+from scipy.signal import lfilter
+
+# ==========================
+# BATCHED INDICATOR KERNEL
+# ==========================
+# Every array here is 2D (symbols x bars) and every indicator runs along the time axis
+# in one pass, so adding symbols adds rows, not Python-level pandas_ta calls.
+# Values match pandas_ta_classic (SMA-seeded EMA / Wilder RMA, adjust=False).
+
+def _seeded_smooth(x, length, alpha, start=0):
+    out = np.full(x.shape, np.nan)
+    seed_at = start + length - 1
+    if x.shape[1] <= seed_at: return out
+    seed = x[:, start:seed_at + 1].mean(axis=1)
+    out[:, seed_at] = seed
+    if x.shape[1] > seed_at + 1:
+        # y[t] = (1 - alpha) * y[t-1] + alpha * x[t], primed with the SMA seed
+        zi = ((1 - alpha) * seed)[:, None]
+        out[:, seed_at + 1:], _ = lfilter([alpha], [1, -(1 - alpha)], x[:, seed_at + 1:], axis=1, zi=zi)
+    return out
+
+def ema_2d(close, length):
+    return _seeded_smooth(close, length, 2.0 / (length + 1))
+
+def rma_2d(x, length, start=0):
+    return _seeded_smooth(x, length, 1.0 / length, start)
+
+def rsi_2d(close, length=14):
+    diff = np.full(close.shape, np.nan)
+    diff[:, 1:] = np.diff(close, axis=1)
+    positive = rma_2d(np.where(diff > 0, diff, 0.0), length, start=1)
+    negative = rma_2d(np.where(diff < 0, diff, 0.0), length, start=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 * positive / (positive + np.abs(negative))
+
+def atr_2d(high, low, close, length=14):
+    high_low = high - low
+    high_low = np.where(high_low != 0, high_low, sys.float_info.epsilon)
+    prev_close = np.full(close.shape, np.nan)
+    prev_close[:, 1:] = close[:, :-1]
+    tr = np.maximum(np.abs(high_low), np.maximum(np.abs(high - prev_close), np.abs(prev_close - low)))
+    tr[:, 0] = np.nan
+    return rma_2d(tr, length, start=1)
+
+def batch_indicators(rates_by_symbol, atr_window=10):
+    # Symbols are stacked per history length so each row keeps the exact seed
+    # window get_market_data would have used for that symbol on its own.
+    groups = {}
+    for symbol, rates in rates_by_symbol.items():
+        groups.setdefault(len(rates), []).append(symbol)
+
+    results = {}
+    for bars, symbols in groups.items():
+        if bars == 0: continue
+        stack = lambda col: np.vstack([np.asarray(rates_by_symbol[s][col], dtype=float) for s in symbols])
+        high, low, close = stack('high'), stack('low'), stack('close')
+
+        ema20, ema50, ema200 = ema_2d(close, 20), ema_2d(close, 50), ema_2d(close, 200)
+        rsi = rsi_2d(close, 14)
+        atr = atr_2d(high, low, close, 14)
+        atr_mean = atr[:, -atr_window:].mean(axis=1) if bars >= atr_window else np.full(len(symbols), np.nan)
+
+        for row, symbol in enumerate(symbols):
+            results[symbol] = {
+                'ema20': ema20[row, -1], 'ema50': ema50[row, -1], 'ema200': ema200[row, -1],
+                'rsi': rsi[row, -1], 'atr': atr[row, -1],
+                'vol_ok': atr[row, -1] > atr_mean[row]
+            }
+    return results
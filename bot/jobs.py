@@ -0,0 +1,177 @@
+import multiprocessing as mp
+import threading
+import time
+from collections import deque
+from multiprocessing.connection import wait
+from bot.engine import TradingEngine
+
+CANCEL_GRACE_SECONDS = 10
+
+# ==========================
+# WORKER PROCESS
+# ==========================
+# Each worker writes to its own pipe, so terminating one can never corrupt a channel another worker uses
+def _run_job(job_id, kind, params, config, conn, cancel_event):
+    try:
+        engine = TradingEngine()
+        engine.config.update(config)
+        progress = lambda done, total: conn.send((job_id, "progress", done, total))
+        runner = engine.run_backtest if kind == "backtest" else engine.run_monte_carlo
+        summary, report_path = runner(**params, progress=progress, cancelled=cancel_event.is_set)
+        conn.send((job_id, "done", summary, report_path))
+    except Exception as e:
+        conn.send((job_id, "error", str(e), None))
+    finally:
+        conn.close()
+
+class Job:
+    def __init__(self, job_id, kind, label, params, config, on_done):
+        self.id = job_id
+        self.kind = kind
+        self.label = label
+        self.params = params
+        self.config = config
+        self.on_done = on_done
+        self.unit = "bars" if kind == "backtest" else "paths"
+        self.status = "QUEUED"
+        self.done = 0
+        self.total = 0
+        self.summary = None
+        self.report_path = None
+        self.error = None
+        self.process = None
+        self.conn = None
+        self.cancel_event = None
+        self.cancel_time = None
+
+    @property
+    def finished(self):
+        return self.status in ("DONE", "FAILED", "CANCELLED")
+
+# ==========================
+# JOB RUNNER
+# ==========================
+class JobRunner:
+    def __init__(self, max_workers=2):
+        self.ctx = mp.get_context("spawn")
+        self.max_workers = max_workers
+        self.jobs = {}
+        self.pending = deque()
+        self.lock = threading.Lock()
+        self.next_id = 1
+        self.is_running = True
+        self.thread = threading.Thread(target=self._pump, daemon=True)
+        self.thread.start()
+
+    def submit(self, kind, params, config, label, on_done=None, cached=None):
+        with self.lock:
+            job = Job(self.next_id, kind, label, params, dict(config), on_done)
+            self.next_id += 1
+            self.jobs[job.id] = job
+            # A result the caller already found in the cache finishes at once, without spawning a worker
+            if cached:
+                job.status = "DONE"; job.summary, job.report_path = cached
+            else:
+                self.pending.append(job)
+        if cached: self._notify(job)
+        return job
+
+    def cancel(self, job_id):
+        finished = None
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if not job or job.finished: return
+            if job in self.pending:
+                self.pending.remove(job)
+                job.status = "CANCELLED"; job.error = "Cancelled"; finished = job
+            elif job.status == "RUNNING":
+                job.status = "CANCELLING"; job.cancel_time = time.time()
+                job.cancel_event.set()
+        if finished: self._notify(finished)
+
+    def clear_finished(self):
+        with self.lock:
+            cleared = [job_id for job_id, job in self.jobs.items() if job.finished]
+            for job_id in cleared: del self.jobs[job_id]
+        return cleared
+
+    def shutdown(self):
+        self.is_running = False
+        with self.lock:
+            self.pending.clear()
+            for job in self.jobs.values():
+                if job.process and job.process.is_alive(): job.process.terminate()
+
+    def _running(self):
+        return [j for j in self.jobs.values() if j.status in ("RUNNING", "CANCELLING")]
+
+    def _start_pending(self):
+        with self.lock:
+            while self.pending and len(self._running()) < self.max_workers:
+                job = self.pending.popleft()
+                job.cancel_event = self.ctx.Event()
+                job.conn, child_conn = self.ctx.Pipe(duplex=False)
+                job.process = self.ctx.Process(
+                    target=_run_job, args=(job.id, job.kind, job.params, job.config, child_conn, job.cancel_event), daemon=True
+                )
+                job.process.start()
+                child_conn.close()
+                job.status = "RUNNING"
+
+    def _handle(self, event):
+        job_id, kind, a, b = event
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if not job or job.finished: return None
+            if kind == "progress":
+                job.done, job.total = a, b
+                return None
+            if kind == "error":
+                job.status = "FAILED"; job.error = a
+            elif isinstance(a, str):
+                job.status = "CANCELLED" if a == "Cancelled" else "FAILED"; job.error = a
+            else:
+                job.status = "DONE"; job.summary = a; job.report_path = b
+                job.done = job.total
+        return job
+
+    def _notify(self, job):
+        if job.process: job.process.join(timeout=1)
+        if job.conn: job.conn.close()
+        if job.on_done:
+            try: job.on_done(job)
+            except Exception: pass
+
+    def _drain(self, job):
+        finished = None
+        try:
+            while job.conn.poll():
+                finished = self._handle(job.conn.recv()) or finished
+        except (EOFError, OSError):
+            pass
+        return finished
+
+    def _pump(self):
+        while self.is_running:
+            self._start_pending()
+            with self.lock: running = self._running()
+            if running: wait([j.conn for j in running], timeout=0.2)
+            else: time.sleep(0.2)
+
+            finished = []
+            for job in running:
+                # Check liveness before draining: everything a dead worker sent is already in its pipe
+                alive = job.process.is_alive()
+                done = self._drain(job)
+                if done: finished.append(done); continue
+                with self.lock:
+                    if job.finished: continue
+                    if not alive:
+                        job.status = "FAILED"; job.error = f"Worker exited (code {job.process.exitcode})"
+                        finished.append(job)
+                    elif job.status == "CANCELLING" and time.time() - job.cancel_time > CANCEL_GRACE_SECONDS:
+                        job.process.terminate()
+                        job.status = "CANCELLED"; job.error = "Cancelled"
+                        finished.append(job)
+
+            for job in finished: self._notify(job)
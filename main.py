@@ -1,5 +1,7 @@
 import flet as ft
 from bot.engine import TradingEngine
+from bot.jobs import JobRunner
+import multiprocessing
 import time
 import webbrowser
 import os
@@ -12,6 +14,8 @@ def main(page: ft.Page):
     page.padding = 0
     
     bot_engine = TradingEngine()
+    job_runner = JobRunner(max_workers=2)
+    page.on_disconnect = lambda e: job_runner.shutdown()
 
     # SHARED
     status_icon = ft.Icon(ft.Icons.CIRCLE, color="red", size=15)
@@ -137,78 +141,98 @@ def main(page: ft.Page):
     txt_bt_balance = ft.Text("$0.00", size=20, weight="bold", color="white")
     txt_bt_trades = ft.Text("0", size=20, weight="bold", color="white")
 
+    txt_bt_source = ft.Text("", size=12, color="grey")
     bt_stats_container = ft.Container(
-        content=ft.Row([
+        content=ft.Column([txt_bt_source, ft.Row([
             ft.Column([ft.Text("Net Profit", color="grey"), txt_bt_profit], horizontal_alignment="center"),
             ft.Column([ft.Text("Win Rate", color="grey"), txt_bt_winrate], horizontal_alignment="center"),
             ft.Column([ft.Text("Final Bal", color="grey"), txt_bt_balance], horizontal_alignment="center"),
             ft.Column([ft.Text("Trades", color="grey"), txt_bt_trades], horizontal_alignment="center"),
-        ], alignment="spaceEvenly"),
+        ], alignment="spaceEvenly")]),
         bgcolor="#222222", padding=20, border_radius=10, visible=False 
     )
 
     dd_symbol = ft.Dropdown(options=[ft.dropdown.Option(s) for s in bot_engine.SYMBOLS], width=200, label="Symbol")
+    input_seed = ft.TextField(label="Simulation Seed", value="1", width=150)
     txt_bt_status = ft.Text("Select a symbol to test.", color="grey")
     
-    # 1. Run Backtest -> Updates Mini Terminal AND Opens Report
-    def run_bt(e):
-        if not dd_symbol.value: return
-        txt_bt_status.value = "Running Simulation..."
-        bt_stats_container.visible = False
-        page.update()
-        
-        summary, report_path = bot_engine.run_backtest(dd_symbol.value) # Returns tuple now
-        
-        if isinstance(summary, str): 
-             txt_bt_status.value = f"Error: {summary}"
-        else:
-            # Update UI
+    # Jobs run in worker processes; results land here via the runner thread
+    job_rows = {}
+    jobs_view = ft.Column(spacing=5)
+
+    def show_result(job):
+        if job.status == "DONE":
+            summary = job.summary
+            txt_bt_source.value = f"Results for #{job.id} {job.label}" + (f"  ·  {summary['range']}" if summary.get('range') else "")
             txt_bt_profit.value = f"${summary['net_profit']:.2f}"
             txt_bt_profit.color = "green" if summary['net_profit'] >= 0 else "red"
             txt_bt_winrate.value = f"{summary['win_rate']:.1f}%"
             txt_bt_balance.value = f"${summary['final_balance']:.2f}"
             txt_bt_trades.value = str(summary['total_trades'])
             bt_stats_container.visible = True
-            
-            # Open Report
-            txt_bt_status.value = "✅ Backtest Complete! Report Opened."
-            webbrowser.open(f"file://{report_path}")
+            txt_bt_status.value = f"✅ {job.label} Complete! Report Opened."
+            webbrowser.open(f"file://{job.report_path}")
+        elif job.status == "CANCELLED":
+            txt_bt_status.value = f"{job.label} Cancelled."
+        else:
+            txt_bt_status.value = f"Error: {job.error}"
+        try: page.update()
+        except: pass
+
+    def add_job_row(job):
+        bar = ft.ProgressBar(width=250, value=0, color="cyan", bgcolor="#333333")
+        txt_state = ft.Text("QUEUED", size=12, color="grey")
+        btn_cancel = ft.IconButton(ft.Icons.CANCEL, icon_color="red", tooltip="Cancel", on_click=lambda e, jid=job.id: job_runner.cancel(jid))
+        row = ft.Row([ft.Text(f"#{job.id} {job.label}", width=260), bar, txt_state, btn_cancel])
+        job_rows[job.id] = (bar, txt_state, btn_cancel, row)
+        jobs_view.controls.insert(0, row)
+        if not job.finished: txt_bt_status.value = f"Queued {job.label}."
         page.update()
 
+    def clear_jobs(e):
+        for job_id in job_runner.clear_finished():
+            row = job_rows.pop(job_id, None)
+            if row: jobs_view.controls.remove(row[3])
+        page.update()
+
+    btn_clear_jobs = ft.TextButton("CLEAR FINISHED", icon=ft.Icons.CLEAR_ALL, on_click=clear_jobs)
+
+    def clear_cache(e):
+        bot_engine.cache.clear()
+        txt_bt_status.value = "🗑️ Result cache and cached reports cleared."
+        page.update()
+
+    btn_clear_cache = ft.TextButton("CLEAR CACHE", icon=ft.Icons.DELETE_SWEEP, on_click=clear_cache)
+
+    # 1. Run Backtest -> Updates Mini Terminal AND Opens Report
+    def run_bt(e):
+        if not dd_symbol.value: return
+        job = job_runner.submit("backtest", {"symbol": dd_symbol.value}, bot_engine.config, f"Backtest {dd_symbol.value}", on_done=show_result)
+        add_job_row(job)
+
     btn_backtest = ft.ElevatedButton("RUN BACKTEST (REPORT + STATS)", icon=ft.Icons.HISTORY, on_click=run_bt)
 
     # 2. Run Monte Carlo -> Updates Mini Terminal AND Opens Report
     def run_mc(e):
-        txt_bt_status.value = "Running Stress Test..."
-        bt_stats_container.visible = False
-        page.update()
-        
-        summary, report_path = bot_engine.run_monte_carlo() # Returns tuple now
-        
-        # Update UI with Median Stats
-        txt_bt_profit.value = f"${summary['net_profit']:.2f}"
-        txt_bt_profit.color = "green" if summary['net_profit'] >= 0 else "red"
-        txt_bt_winrate.value = f"{summary['win_rate']:.1f}%"
-        txt_bt_balance.value = f"${summary['final_balance']:.2f}"
-        txt_bt_trades.value = str(summary['total_trades'])
-        bt_stats_container.visible = True
-        
-        # Open Report
-        webbrowser.open(f"file://{report_path}")
-        txt_bt_status.value = "✅ Stress Test Complete! Report Opened."
-        page.update()
+        try: seed = int(input_seed.value)
+        except: seed = 1
+        cached = bot_engine.cache.get_result(bot_engine.monte_carlo_key(seed=seed))
+        job = job_runner.submit("monte_carlo", {"seed": seed}, bot_engine.config, f"Stress Test (seed {seed})", on_done=show_result, cached=cached)
+        add_job_row(job)
 
     btn_mc = ft.ElevatedButton("RUN RISK SIMULATION (REPORT + STATS)", icon=ft.Icons.SHUFFLE, on_click=run_mc)
 
     tab_analytics = ft.Container(
         content=ft.Column([
             ft.Text("Strategy Analytics", size=18, weight="bold"),
-            dd_symbol,
+            ft.Row([dd_symbol, input_seed]),
             ft.Container(height=10),
             ft.Row([btn_backtest, btn_mc]),
             txt_bt_status,
             ft.Divider(),
             bt_stats_container,
+            ft.Row([ft.Text("Jobs", size=16, weight="bold"), btn_clear_jobs, btn_clear_cache]),
+            jobs_view,
         ], scroll=ft.ScrollMode.AUTO), padding=30
     )
 
@@ -275,6 +299,14 @@ def main(page: ft.Page):
                      vals = [p.y for p in points]
                      live_chart.min_y = min(vals) * 0.99
                      live_chart.max_y = max(vals) * 1.01
+            for job in list(job_runner.jobs.values()):
+                # clear_jobs may drop a row from the event thread at any moment, so read it once
+                row = job_rows.get(job.id)
+                if not row: continue
+                bar, txt_state, btn_cancel, _ = row
+                bar.value = (job.done / job.total) if job.total else (1 if job.finished else (None if job.status == "RUNNING" else 0))
+                txt_state.value = f"{job.status}  {job.done:,}/{job.total:,} {job.unit}" if job.total else job.status
+                btn_cancel.visible = not job.finished
             try: page.update()
             except: pass
             time.sleep(0.5)
@@ -282,4 +314,5 @@ def main(page: ft.Page):
     page.run_thread(update_ui)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     ft.app(target=main)
\ No newline at end of file
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+ta = pytest.importorskip("pandas_ta_classic")
+
+from bot.indicators import batch_indicators
+
+
+def make_rates(bars, seed, flat=False):
+    rng = np.random.default_rng(seed)
+    close = np.full(bars, 1000.0) if flat else 1000 + np.cumsum(rng.normal(0, 1, bars))
+    high = close if flat else close + rng.random(bars)
+    low = close if flat else close - rng.random(bars)
+    return pd.DataFrame({"open": close, "high": high, "low": low, "close": close}).to_records(index=False)
+
+
+def last(series):
+    # pandas_ta returns None when the history is shorter than the indicator length
+    return np.nan if series is None else series.iloc[-1]
+
+
+def reference(rates):
+    # Mirrors the per-symbol pipeline get_market_data used before batching
+    df = pd.DataFrame(rates)
+    atr = ta.atr(df["high"], df["low"], df["close"], length=14)
+    atr_mean = np.nan if atr is None else atr.rolling(window=10).mean().iloc[-1]
+    return {
+        "ema20": last(ta.ema(df["close"], length=20)),
+        "ema50": last(ta.ema(df["close"], length=50)),
+        "ema200": last(ta.ema(df["close"], length=200)),
+        "rsi": last(ta.rsi(df["close"], length=14)),
+        "atr": last(atr),
+        "vol_ok": last(atr) > atr_mean,
+    }
+
+
+def test_batch_matches_pandas_ta_for_mixed_lengths():
+    rates = {f"S{i}": make_rates(200, i) for i in range(4)}
+    rates.update({"S150": make_rates(150, 10), "S15": make_rates(15, 11), "S5": make_rates(5, 12)})
+    rates["FLAT"] = make_rates(200, 13, flat=True)
+
+    batch = batch_indicators(rates)
+
+    assert set(batch) == set(rates)
+    for symbol, symbol_rates in rates.items():
+        expected = reference(symbol_rates)
+        for name in ("ema20", "ema50", "ema200", "rsi", "atr"):
+            np.testing.assert_allclose(batch[symbol][name], expected[name], rtol=1e-12, equal_nan=True, err_msg=f"{symbol} {name}")
+        assert bool(batch[symbol]["vol_ok"]) == bool(expected["vol_ok"]), symbol